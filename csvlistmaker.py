@@ -1,11 +1,23 @@
 # csvlistmaker.py
+import asyncio
+import collections
+import functools
+import hashlib
 import os
 import pickle
+import re
+import sys
 import time
 import csv
+import unicodedata
+import aiohttp
+import orjson
+from google.auth.transport.requests import Request
 from google_auth_oauthlib.flow import InstalledAppFlow
 from googleapiclient.discovery import build
 from googleapiclient.errors import HttpError
+from googleapiclient.http import HttpRequest
+from googleapiclient.model import JsonModel
 
 # ------------------------------
 # CONFIGURATION
@@ -13,15 +25,51 @@ from googleapiclient.errors import HttpError
 # Google API scopes for YouTube Data API
 SCOPES = ["https://www.googleapis.com/auth/youtube"]
 
+# YouTube Data API endpoint used for direct (aiohttp) requests
+API_URL = "https://www.googleapis.com/youtube/v3"
+
 # Local files to cache data, remaining songs, and failed/skipped logs
-CACHE_FILE = "existing_videos.pickle"
-REMAINING_FILE = "remaining_songs.pickle"
+CACHE_FILE = "existing_videos.txt"  # one normalized title per line, append-only
+REMAINING_FILE = "remaining_songs.json"
+SEARCH_CACHE_FILE = "search_cache.json"
 LOG_FILE = "failed_or_skipped.csv"
 
+# Pickled caches written by older versions, converted once by migrate_legacy_files()
+LEGACY_CACHE_FILE = "existing_videos.pickle"
+LEGACY_REMAINING_FILE = "remaining_songs.pickle"
+
+# Append handle on CACHE_FILE, opened once the playlist titles are known
+_title_log = None
+
 # Import batching and delay settings to respect YouTube API limits
-BATCH_SIZE = 50
-SEARCH_DELAY = 1  # seconds between searches
-INSERT_DELAY = 1  # seconds between insertions
+BATCH_SIZE = 50  # videos per batch insert request (API maximum)
+SEARCH_DELAY = 1  # minimum seconds between searches of one worker
+INSERT_DELAY = 1  # minimum seconds between batch insert starts
+CONCURRENCY = 8  # parallel search workers; up to CONCURRENCY searches start per SEARCH_DELAY
+
+# Valid YouTube video IDs; checked before an ID is spliced into a request body
+VIDEO_ID_RE = re.compile(r"[A-Za-z0-9_-]{11}")
+
+# ------------------------------
+# API ERRORS
+# ------------------------------
+class ApiError(Exception):
+    """
+    Error returned by the YouTube Data API for a direct aiohttp request.
+    """
+    def __init__(self, status, reason):
+        super().__init__(f"HTTP {status}: {reason}")
+        self.status = status
+        self.reason = reason
+
+def http_error_reason(e):
+    """
+    Extract the error reason (e.g. "quotaExceeded") from a googleapiclient HttpError.
+    """
+    try:
+        return e.error_details[0]['reason'] if hasattr(e, 'error_details') else ""
+    except:
+        return str(e)
 
 # ------------------------------
 # LOGGING HELPER
@@ -34,12 +82,33 @@ def log(msg, gui=None, color="green"):
     if gui:
         gui.log(msg, color)
 
+# ------------------------------
+# TITLE NORMALIZATION
+# ------------------------------
+def normalize_title(s):
+    """
+    Canonical key for comparing song queries and video titles:
+    casefolded, accents and punctuation dropped, whitespace collapsed.
+    """
+    chars = (
+        c for c in unicodedata.normalize("NFKD", s.casefold())
+        if not unicodedata.combining(c) and (c.isalnum() or c.isspace())
+    )
+    return re.sub(r"\s+", " ", "".join(chars)).strip()
+
+def song_key(query):
+    """
+    Normalized key for a song query, falling back to the query itself when
+    normalizing leaves nothing (emoji- or punctuation-only names).
+    """
+    return normalize_title(query) or query
+
 # ------------------------------
 # GOOGLE AUTHENTICATION
 # ------------------------------
-def get_authenticated_service(client_secret_path, gui=None):
+def get_credentials(client_secret_path, gui=None):
     """
-    Authenticate with Google using OAuth2 and return a YouTube service object.
+    Authenticate with Google using OAuth2 and return the credentials.
     """
     creds = None
     token_pickle = "youtube_token.pickle"
@@ -54,192 +123,523 @@ def get_authenticated_service(client_secret_path, gui=None):
         with open(token_pickle, "wb") as token:
             pickle.dump(creds, token)
         log("Google authentication successful!", gui)
-    return build("youtube", "v3", credentials=creds)
+    return creds
+
+class OrjsonModel(JsonModel):
+    """
+    googleapiclient response model that decodes JSON with orjson instead of the stdlib.
+    """
+    def deserialize(self, content):
+        try:
+            body = orjson.loads(content)
+        except orjson.JSONDecodeError:
+            return content
+        if self._data_wrapper and "data" in body:
+            body = body["data"]
+        return body
+
+def get_authenticated_service(creds):
+    """
+    Build a YouTube service object from OAuth2 credentials.
+    """
+    return build("youtube", "v3", credentials=creds, model=OrjsonModel())
+
+def auth_headers(creds):
+    """
+    Return the bearer token header for direct API requests, refreshing the token if needed.
+    """
+    if not creds.valid:
+        creds.refresh(Request())
+    return {"Authorization": f"Bearer {creds.token}"}
+
+# ------------------------------
+# DIRECT API REQUESTS
+# ------------------------------
+async def api_request(session, creds, method, path, **kwargs):
+    """
+    Send an authorized request to the YouTube Data API and return the decoded JSON body.
+    """
+    async with session.request(method, f"{API_URL}/{path}", headers=auth_headers(creds), **kwargs) as resp:
+        if resp.status >= 400:
+            # Error bodies may be empty or an HTML page from the Google front end
+            try:
+                error = orjson.loads(await resp.read()).get("error")
+            except (orjson.JSONDecodeError, AttributeError):
+                error = None
+            if not isinstance(error, dict):
+                error = {}
+            errors = error.get("errors") or [{}]
+            reason = errors[0].get("reason") or error.get("message") or resp.reason or ""
+            raise ApiError(resp.status, reason)
+        return await resp.json(loads=orjson.loads, content_type=None)
+
+# ------------------------------
+# RATE LIMITING
+# ------------------------------
+class RateLimiter:
+    """
+    Shared rate limiter: lets one request through every `interval` seconds across all tasks,
+    sleeping only for whatever is left of the interval instead of a fixed delay.
+    """
+    def __init__(self, interval):
+        self.interval = interval
+        self.next = 0.0
+
+    async def wait(self):
+        # Reserve the next free slot before sleeping so concurrent callers never share one
+        now = time.monotonic()
+        delay = self.next - now
+        self.next = max(now, self.next) + self.interval
+        if delay > 0:
+            await asyncio.sleep(delay)
 
 # ------------------------------
 # FETCH EXISTING PLAYLIST VIDEOS
 # ------------------------------
-def get_existing_video_titles(youtube, playlist_id, gui=None):
+async def get_existing_video_titles(creds, playlist_id, gui=None):
     """
     Retrieve existing video titles from a playlist and cache them locally.
+    Titles added later in the run are appended to the cache via remember_title().
     """
+    global _title_log
+    close_title_log()  # never leak a handle left over from an earlier import
     if os.path.exists(CACHE_FILE):
-        with open(CACHE_FILE, "rb") as f:
+        with open(CACHE_FILE, encoding="utf-8") as f:
             log("Cache found. Using local cached video list.", gui)
-            return pickle.load(f)
+            titles = set(filter(None, f.read().splitlines()))
+        _title_log = open(CACHE_FILE, "a", encoding="utf-8")
+        return titles
 
     log("Cache not found. Fetching playlist from YouTube...", gui)
     titles = set()
-    next_page = None
-    while True:
-        try:
-            response = youtube.playlistItems().list(
-                part="snippet",
-                playlistId=playlist_id,
-                maxResults=50,
-                pageToken=next_page
-            ).execute()
-        except HttpError as e:
-            status = e.resp.status
-            reason = ""
-            try:
-                reason = e.error_details[0]['reason'] if hasattr(e, 'error_details') else ""
-            except:
-                reason = str(e)
+    pages = asyncio.Queue(maxsize=2)  # fetched pages waiting to be parsed
 
-            if status == 403 and "quotaExceeded" in reason:
+    async def fetch_pages(session):
+        # Request the next page as soon as its token is known, while earlier pages are parsed.
+        # The end-of-pages marker is not put from a `finally`: when the consumer fails this
+        # task is cancelled, and waiting on the full queue again would hang forever.
+        next_page = None
+        complete = False
+        error = None
+        try:
+            while True:
+                params = {
+                    "part": "snippet",
+                    "playlistId": playlist_id,
+                    "maxResults": 50,
+                    "fields": "nextPageToken,items/snippet/title"  # only what we read
+                }
+                if next_page:
+                    params["pageToken"] = next_page
+                response = await api_request(session, creds, "GET", "playlistItems", params=params)
+                await pages.put(response.get("items", []))
+                next_page = response.get("nextPageToken")
+                if not next_page:
+                    complete = True
+                    break
+        except ApiError as e:
+            if e.status == 403 and "quotaExceeded" in e.reason:
                 log("❌ Quota exceeded: YouTube API limit reached! Cannot fetch playlist.", gui, "red")
             else:
-                log(f"❌ YouTube API error (HTTP {status}): {reason}", gui, "red")
-            return titles  # return empty or partial list
+                log(f"❌ YouTube API error (HTTP {e.status}): {e.reason}", gui, "red")
+        except Exception as e:
+            error = e
+        await pages.put(None)
+        if error:
+            raise error
+        return complete
 
-        for item in response.get("items", []):
-            titles.add(item["snippet"]["title"].lower())
-        next_page = response.get("nextPageToken")
-        if not next_page:
-            break
+    async with aiohttp.ClientSession() as session:
+        producer = asyncio.ensure_future(fetch_pages(session))
+        try:
+            while True:
+                items = await pages.get()
+                if items is None:
+                    break
+                for item in items:
+                    title = normalize_title(item["snippet"]["title"])
+                    if title:  # emoji/punctuation-only titles would match every such song
+                        titles.add(title)
+        finally:
+            producer.cancel()  # no-op once the producer has finished
+        if not await producer:
+            return titles  # return empty or partial list
 
-    with open(CACHE_FILE, "wb") as f:
-        pickle.dump(titles, f)
+    with open(CACHE_FILE, "w", encoding="utf-8") as f:
+        f.writelines(title + "\n" for title in titles)
+    _title_log = open(CACHE_FILE, "a", encoding="utf-8")
     log(f"{len(titles)} existing videos cached.", gui)
     return titles
 
+def remember_title(titles, key):
+    """
+    Mark a song as added: update the in-memory set and append it to the cache file,
+    so a crash or quota stop never loses it.
+    """
+    if not key:
+        return
+    titles.add(key)
+    if _title_log:
+        _title_log.write(key + "\n")
+        _title_log.flush()
+
+def close_title_log():
+    """
+    Close the title cache append handle.
+    """
+    global _title_log
+    if _title_log:
+        _title_log.close()
+        _title_log = None
+
+def migrate_legacy_files(gui=None):
+    """
+    Convert the pickled title cache and remaining-songs list from older versions
+    to the current text/JSON files, then remove the pickles.
+    """
+    if os.path.exists(LEGACY_CACHE_FILE) and not os.path.exists(CACHE_FILE):
+        with open(LEGACY_CACHE_FILE, "rb") as f:
+            titles = set(filter(None, map(normalize_title, pickle.load(f))))
+        with open(CACHE_FILE, "w", encoding="utf-8") as f:
+            f.writelines(title + "\n" for title in titles)
+        os.remove(LEGACY_CACHE_FILE)
+        log(f"Converted {LEGACY_CACHE_FILE} to {CACHE_FILE}.", gui)
+
+    if os.path.exists(LEGACY_REMAINING_FILE) and not os.path.exists(REMAINING_FILE):
+        with open(LEGACY_REMAINING_FILE, "rb") as f:
+            songs = pickle.load(f)
+        with open(REMAINING_FILE, "wb") as f:
+            f.write(orjson.dumps(songs))
+        os.remove(LEGACY_REMAINING_FILE)
+        log(f"Converted {LEGACY_REMAINING_FILE} to {REMAINING_FILE}.", gui)
+
 # ------------------------------
-# ADD VIDEO TO PLAYLIST
+# SEARCH RESULT CACHE
 # ------------------------------
-def add_video(youtube, playlist_id, video_id, gui=None, retries=3):
+def load_search_cache():
+    """
+    Load the query -> video ID cache saved by previous runs.
+    """
+    if os.path.exists(SEARCH_CACHE_FILE):
+        with open(SEARCH_CACHE_FILE, "rb") as f:
+            return orjson.loads(f.read())
+    return {}
+
+def save_search_cache(cache):
     """
-    Add a video to a playlist, with retries for transient errors.
+    Save the query -> video ID cache so re-runs skip already resolved searches.
     """
+    with open(SEARCH_CACHE_FILE, "wb") as f:
+        f.write(orjson.dumps(cache))
+
+def search_cache_key(key):
+    """
+    Return the search cache key for a normalized song key.
+    """
+    return hashlib.sha1(key.encode("utf-8")).hexdigest()
+
+# ------------------------------
+# ADD VIDEOS TO PLAYLIST (BATCH)
+# ------------------------------
+def insert_request_factory(youtube, playlist_id):
+    """
+    Return a function that builds a playlistItems.insert request for a video ID.
+    The discovery request is built once; each call only splices the video ID
+    into a precomputed JSON body.
+    """
+    template = youtube.playlistItems().insert(part="snippet", body={})
+    prefix = ('{"snippet":{"playlistId":' + orjson.dumps(playlist_id).decode()
+              + ',"resourceId":{"kind":"youtube#video","videoId":"')
+    suffix = '"}}}'
+    new_request = functools.partial(
+        HttpRequest, template.http, template.postproc, template.uri,
+        method=template.method, methodId=template.methodId
+    )
+
+    def insert_request(video_id):
+        # Own headers per request: the batch writes auth headers into them in place
+        return new_request(body=prefix + video_id + suffix, headers=dict(template.headers))
+
+    return insert_request
+
+def add_videos_batch(youtube, insert_request, resolved, gui=None, retries=3):
+    """
+    Add up to BATCH_SIZE videos to a playlist in a single batch HTTP request,
+    retrying failed items for transient errors.
+    Batches are sent in CSV order, but Google may run the inserts inside one batch
+    in any order, so songs within a batch of BATCH_SIZE can land shuffled.
+    Returns a list of (song, error) pairs; error is None for videos that were added.
+    """
+    errors = {}
+
+    def callback(request_id, response, exception):
+        errors[request_id] = exception
+
+    pending = list(range(len(resolved)))
     for attempt in range(retries):
-        try:
-            youtube.playlistItems().insert(
-                part="snippet",
-                body={
-                    "snippet": {
-                        "playlistId": playlist_id,
-                        "resourceId": {"kind": "youtube#video", "videoId": video_id}
-                    }
-                }
-            ).execute()
-            return True
-        except HttpError as e:
-            status = e.resp.status
-            reason = ""
-            try:
-                reason = e.error_details[0]['reason'] if hasattr(e, 'error_details') else ""
-            except:
-                reason = str(e)
+        batch = youtube.new_batch_http_request(callback=callback)
+        for i in pending:
+            _, video_id = resolved[i]
+            batch.add(insert_request(video_id), request_id=str(i))
+        batch.execute()
 
+        retry = []
+        for i in pending:
+            e = errors[str(i)]
+            if e is None:
+                continue
+            status = e.resp.status
+            reason = http_error_reason(e)
             if status == 403 and "quotaExceeded" in reason:
-                log("❌ Quota exceeded: YouTube API limit reached! Cannot add more videos.", gui, "red")
-                return False
-            else:
-                log(f"❌ YouTube API error adding video (HTTP {status}): {reason}", gui, "red")
-                if attempt < retries - 1:
-                    time.sleep(3)
-                else:
-                    return False
+                continue
+            log(f"❌ YouTube API error adding video (HTTP {status}): {reason}", gui, "red")
+            retry.append(i)
+        if not retry or attempt == retries - 1:
+            break
+        pending = retry
+        time.sleep(3)
+
+    return [(song, errors[str(i)]) for i, (song, _) in enumerate(resolved)]
 
 # ------------------------------
 # READ CSV SONGS
 # ------------------------------
-def read_csv_songs(csv_file, gui=None):
+def read_csv_songs(csv_file, gui=None, duplicates=None):
     """
-    Read songs from CSV and return as a list of dictionaries with query, track, and artist.
+    Stream songs from CSV, yielding one dictionary with query, normalized key, track,
+    and artist per unique song. Repeated songs are skipped so each is searched only once,
+    and appended to `duplicates` (if given) marked "Duplicate in CSV".
     """
-    songs = []
+    log(f"Reading songs from {os.path.basename(csv_file)}...", gui)
+    seen = set()
     with open(csv_file, newline="", encoding="utf-8") as f:
-        reader = csv.DictReader(f)
-        for row in reader:
+        for row in csv.DictReader(f):
             query = f"{row['Track Name']} {row['Artists']}".lower()
-            songs.append({"query": query, "track": row['Track Name'], "artist": row['Artists']})
-    log(f"{len(songs)} songs loaded from CSV.", gui)
-    return songs
+            key = sys.intern(song_key(query))
+            song = {"query": query, "key": key, "track": row['Track Name'], "artist": row['Artists']}
+            if key in seen:
+                log(f"Duplicate in CSV, skipped: {song['track']} - {song['artist']}", gui, "orange")
+                if duplicates is not None:
+                    duplicates.append({**song, "Reason": "Duplicate in CSV"})
+                continue
+            seen.add(key)
+            yield song
 
 # ------------------------------
-# MAIN IMPORT FUNCTION
+# CONCURRENT SEARCH + BATCH INSERT
 # ------------------------------
-def import_csv_to_youtube(playlist_id, csv_file, client_secret_path, gui=None):
+async def import_songs(youtube, creds, playlist_id, songs, existing_titles, gui=None):
     """
-    Main function: imports CSV songs into a YouTube playlist, handles caching, failures, and logging.
+    Search songs concurrently (CONCURRENCY workers pulling from the `songs` iterator)
+    and insert the found videos in batches of BATCH_SIZE.
+    Searches finish in any order, but videos are queued for insertion in CSV order.
+    Returns the failed/skipped log and the songs left for the next run (also in CSV order).
     """
-    youtube = get_authenticated_service(client_secret_path, gui)
-    existing_titles = get_existing_video_titles(youtube, playlist_id, gui)
-    log(f"{len(existing_titles)} videos already exist.", gui)
-
-    # Load remaining songs from previous run if available
-    if os.path.exists(REMAINING_FILE):
-        with open(REMAINING_FILE, "rb") as f:
-            remaining_songs = pickle.load(f)
-        log(f"{len(remaining_songs)} remaining songs loaded.", gui)
-    else:
-        remaining_songs = read_csv_songs(csv_file, gui)
-
     failed_log = []
-    added_count = 0
+    remaining_songs = []
+    resolved = collections.deque()  # (song, video_id) pairs waiting for the next batch insert
+    finished = {}  # CSV index -> (song, video_id) or None, waiting for earlier songs to finish
+    next_index = 0  # CSV index given to the next song a worker pulls
+    next_release = 0  # lowest CSV index not yet released to `resolved`
+    search_cache = load_search_cache()
+    new_searches = 0
+    dropped_ids = 0  # cached video IDs removed after a failed insert
+    insert_request = insert_request_factory(youtube, playlist_id)
+    songs = iter(songs)
+    loop = asyncio.get_running_loop()
+    # Shared by all workers, so spread CONCURRENCY search starts over each SEARCH_DELAY
+    search_limiter = RateLimiter(SEARCH_DELAY / CONCURRENCY)
+    insert_limiter = RateLimiter(INSERT_DELAY)
+    batch_lock = asyncio.Lock()
+    stop = asyncio.Event()  # set once quota is hit or the API fails
 
-    while remaining_songs:
-        song = remaining_songs.pop(0)
-        query = song["query"]
+    def stop_import(song, status, reason):
+        # status is None for errors that never got an HTTP response (network, auth refresh, ...)
+        quota_hit = status == 403 and "quotaExceeded" in reason
+        if not stop.is_set():
+            if quota_hit:
+                log("❌ Quota exceeded: YouTube API limit reached! Stopping import.", gui, "red")
+            elif status is None:
+                log(f"❌ Error: {reason}. Stopping import.", gui, "red")
+            else:
+                log(f"❌ YouTube API error (HTTP {status}): {reason}", gui, "red")
+        failed_log.append({**song, "Reason": "Quota exceeded" if quota_hit else reason})
+        stop.set()
+        remaining_songs.append(song)
 
-        # Skip if already in playlist
-        if query in existing_titles:
-            failed_log.append({**song, "Reason": "Already added"})
-            continue
+    async def flush(chunk):
+        nonlocal dropped_ids
+        async with batch_lock:
+            if stop.is_set():
+                remaining_songs.extend(song for song, _ in chunk)
+                return
+            try:
+                await insert_limiter.wait()
+                results = await loop.run_in_executor(
+                    None, add_videos_batch, youtube, insert_request, chunk, gui
+                )
+            except HttpError as e:
+                for song, _ in chunk:
+                    stop_import(song, e.resp.status, http_error_reason(e))
+                return
+            except Exception as e:
+                # Timeouts, socket or credential errors: keep the whole chunk for the next run
+                for song, _ in chunk:
+                    stop_import(song, None, f"{type(e).__name__}: {e}")
+                return
 
-        try:
-            # Search YouTube for video
-            search_resp = youtube.search().list(
-                q=query,
-                part="id",
-                type="video",
-                maxResults=1
-            ).execute()
-            time.sleep(SEARCH_DELAY)
-
-            if search_resp["items"]:
-                video_id = search_resp["items"][0]["id"]["videoId"]
-                if add_video(youtube, playlist_id, video_id, gui):
-                    existing_titles.add(query)
-                    added_count += 1
+            for song, e in results:
+                if e is None:
+                    remember_title(existing_titles, song["key"])
                     log(f"Added: {song['track']} - {song['artist']}", gui, "green")
+                elif e.resp.status == 403 and "quotaExceeded" in http_error_reason(e):
+                    stop_import(song, e.resp.status, "quotaExceeded")
                 else:
-                    failed_log.append({**song, "Reason": "Failed to add or quota hit"})
-                time.sleep(INSERT_DELAY)
-            else:
+                    # The video can't be added (removed, private, ...): search again next run
+                    if search_cache.pop(search_cache_key(song["key"]), None):
+                        dropped_ids += 1
+                    failed_log.append({**song, "Reason": "Failed to add"})
+
+    def release(index, item):
+        # Reorder buffer: hand results to `resolved` strictly in CSV index order.
+        # Every pulled song must be released (item None if it has nothing to insert).
+        nonlocal next_release
+        finished[index] = item
+        while next_release in finished:
+            item = finished.pop(next_release)
+            next_release += 1
+            if item:
+                resolved.append(item)
+
+    async def process_song(session, song):
+        # Resolve a song to a video ID; returns (song, video_id) or None
+        nonlocal new_searches
+        query = song["query"]
+        key = search_cache_key(song["key"])
+
+        # Reuse the video found by a previous run instead of paying for a new search
+        if key in search_cache:
+            video_id = search_cache[key]
+        else:
+            try:
+                # Search YouTube for video
+                await search_limiter.wait()
+                search_resp = await api_request(session, creds, "GET", "search", params={
+                    "q": query,
+                    "part": "id",
+                    "type": "video",
+                    "maxResults": 1
+                })
+            except ApiError as e:
+                stop_import(song, e.status, e.reason)
+                return None
+
+            if not search_resp["items"]:
                 log(f"Video not found: {song['track']} - {song['artist']}", gui, "orange")
                 failed_log.append({**song, "Reason": "Not found"})
+                return None
+            video_id = search_resp["items"][0]["id"]["videoId"]
+            search_cache[key] = video_id
+            new_searches += 1
+            if new_searches % BATCH_SIZE == 0:
+                save_search_cache(search_cache)
 
-            # Batch pause
-            if added_count % BATCH_SIZE == 0 and added_count > 0:
-                log(f"{added_count} songs processed. Pausing briefly...", gui)
-                time.sleep(5)
+        if not VIDEO_ID_RE.fullmatch(video_id):
+            log(f"Invalid video ID for: {song['track']} - {song['artist']}", gui, "orange")
+            failed_log.append({**song, "Reason": "Invalid video ID"})
+            return None
+        return song, video_id
 
-        except HttpError as e:
-            status = e.resp.status
-            reason = ""
+    async def worker(session):
+        nonlocal next_index
+        # Workers share one iterator, so only CONCURRENCY rows are in flight at a time
+        for song in songs:
+            index = song["index"] = next_index
+            next_index += 1
+            if stop.is_set():
+                remaining_songs.append(song)
+                release(index, None)
+                break
+            # Skip if already in playlist
+            if song["key"] in existing_titles:
+                failed_log.append({**song, "Reason": "Already added"})
+                release(index, None)
+                continue
+            item = None
             try:
-                reason = e.error_details[0]['reason'] if hasattr(e, 'error_details') else ""
-            except:
-                reason = str(e)
+                item = await process_song(session, song)
+            except Exception as e:
+                # Save the song for the next run instead of losing it with the worker
+                stop_import(song, None, f"{type(e).__name__}: {e}")
+            release(index, item)
 
-            if status == 403 and "quotaExceeded" in reason:
-                log("❌ Quota exceeded: YouTube API limit reached! Stopping import.", gui, "red")
-                failed_log.append({**song, "Reason": "Quota exceeded"})
-                remaining_songs.insert(0, song)
-                break
-            else:
-                log(f"❌ YouTube API error (HTTP {status}): {reason}", gui, "red")
-                failed_log.append({**song, "Reason": reason})
-                with open(REMAINING_FILE, "wb") as f:
-                    pickle.dump([song] + remaining_songs, f)
-                break
+            if len(resolved) >= BATCH_SIZE:
+                chunk = [resolved.popleft() for _ in range(BATCH_SIZE)]
+                await flush(chunk)
+
+    async with aiohttp.ClientSession() as session:
+        results = await asyncio.gather(
+            *(worker(session) for _ in range(CONCURRENCY)), return_exceptions=True
+        )
+
+    if resolved:
+        await flush(list(resolved))
+    # Keep the unconsumed tail of the CSV for the next run, everything in CSV order
+    remaining_songs.sort(key=lambda song: song["index"])
+    for song in remaining_songs:
+        del song["index"]
+    if stop.is_set():
+        remaining_songs.extend(songs)
+    if new_searches or dropped_ids:
+        save_search_cache(search_cache)
+
+    # A worker can only fail outside process_song (e.g. a bad CSV row); the unread
+    # tail is unknown then, so crash and keep the previous run's state like before
+    for result in results:
+        if isinstance(result, BaseException):
+            raise result
+
+    return failed_log, remaining_songs
+
+# ------------------------------
+# MAIN IMPORT FUNCTION
+# ------------------------------
+def import_csv_to_youtube(playlist_id, csv_file, client_secret_path, gui=None):
+    """
+    Main function: imports CSV songs into a YouTube playlist, handles caching, failures, and logging.
+    """
+    creds = get_credentials(client_secret_path, gui)
+    youtube = get_authenticated_service(creds)
+    migrate_legacy_files(gui)
+    existing_titles = asyncio.run(get_existing_video_titles(creds, playlist_id, gui))
+    log(f"{len(existing_titles)} videos already exist.", gui)
+
+    # The title cache append handle is open from here on; close it even if the import fails,
+    # since the GUI keeps running in the same process
+    try:
+        # Load remaining songs from previous run if available
+        duplicates = []
+        if os.path.exists(REMAINING_FILE):
+            with open(REMAINING_FILE, "rb") as f:
+                songs = orjson.loads(f.read())
+            for song in songs:
+                song.setdefault("key", song_key(song["query"]))
+            log(f"{len(songs)} remaining songs loaded.", gui)
+        else:
+            songs = read_csv_songs(csv_file, gui, duplicates)
+
+        failed_log, remaining_songs = asyncio.run(
+            import_songs(youtube, creds, playlist_id, songs, existing_titles, gui)
+        )
+    finally:
+        close_title_log()
+    failed_log.extend(duplicates)
 
     # Save failed/skipped songs
     if failed_log:
         with open(LOG_FILE, "w", newline="", encoding="utf-8") as f:
-            writer = csv.DictWriter(f, fieldnames=["track", "artist", "Reason", "query"])
+            writer = csv.DictWriter(f, fieldnames=["track", "artist", "Reason", "query"],
+                                    extrasaction="ignore")
             writer.writeheader()
             for entry in failed_log:
                 writer.writerow(entry)
@@ -248,7 +648,9 @@ def import_csv_to_youtube(playlist_id, csv_file, client_secret_path, gui=None):
     # Save remaining songs for next run
     if remaining_songs:
         with open(REMAINING_FILE, "wb") as f:
-            pickle.dump(remaining_songs, f)
+            f.write(orjson.dumps(remaining_songs))
         log(f"{len(remaining_songs)} songs saved for next run.", gui)
+    elif os.path.exists(REMAINING_FILE):
+        os.remove(REMAINING_FILE)
 
     log("Import complete!", gui)
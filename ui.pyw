@@ -25,6 +25,8 @@ ensure_package("pandas")
 ensure_package("google-api-python-client", "googleapiclient.discovery")
 ensure_package("google-auth-httplib2", "google_auth_httplib2")
 ensure_package("google-auth-oauthlib", "google_auth_oauthlib")
+ensure_package("aiohttp")
+ensure_package("orjson")
 
 # Now safe to import
 import customtkinter as ctk
@@ -192,6 +194,8 @@ class YouTubeCSVImporter(ctk.CTk):
                                        "google-api-python-client",
                                        "google-auth-httplib2",
                                        "google-auth-oauthlib",
+                                       "aiohttp",
+                                       "orjson",
                                        "pandas",
                                        "customtkinter"])
                 self.log("Dependencies installed successfully!")